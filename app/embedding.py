@@ -4,7 +4,7 @@ from typing import List, Dict, Any
 import numpy as np
 from langchain_openai import OpenAIEmbeddings
 from app.schema import IssueCollection
-from app.db import SessionLocal, insert_document, reset_db, init_db
+from app.db import session_scope, insert_document, reset_db, init_db, search_similar
 from tqdm import tqdm
 
 # Initialize the embeddings model
@@ -45,8 +45,7 @@ def embed_documents_from_file(file_path: str, batch_size: int = 10) -> int:
     print(f"Processing {total_docs} documents...")
     
     # Process documents in batches
-    db = SessionLocal()
-    try:
+    with session_scope() as db:
         for i in tqdm(range(0, total_docs, batch_size), desc="Processing batches"):
             batch = documents[i:i + batch_size]
             for doc in batch:
@@ -61,8 +60,6 @@ def embed_documents_from_file(file_path: str, batch_size: int = 10) -> int:
                 )
             db.commit()  # Commit after each batch
         return total_docs
-    finally:
-        db.close()
 
 
 def setup_database():
@@ -77,26 +74,21 @@ def reset_database():
     print("Database reset successfully.")
 
 
-def query_similar(query_text: str, limit: int = 5) -> List[Dict]:
-    """Query documents similar to the given text."""
+def query_similar(db, query_text: str, limit: int = 5) -> List[Dict]:
+    """Query documents similar to the given text using the provided database session."""
     # Generate embedding for the query
     query_embedding = get_embedding(query_text)
     
     # Search for similar documents
-    db = SessionLocal()
-    try:
-        similar_docs = []
-        from app.db import search_similar
-        results = search_similar(db, query_embedding, limit)
-        
-        for doc in results:
-            similar_docs.append({
-                "id": doc.id,
-                "title": doc.title,
-                "content": doc.content[:200] + "..." if len(doc.content) > 200 else doc.content,
-                "metadata": doc.metadata
-            })
-        
-        return similar_docs
-    finally:
-        db.close()
\ No newline at end of file
+    similar_docs = []
+    results = search_similar(db, query_embedding, limit)
+    
+    for doc in results:
+        similar_docs.append({
+            "id": doc.id,
+            "title": doc.title,
+            "content": doc.content[:200] + "..." if len(doc.content) > 200 else doc.content,
+            "metadata": doc.metadata
+        })
+    
+    return similar_docs
\ No newline at end of file
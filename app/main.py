@@ -4,6 +4,7 @@ import sys
 import click
 from pathlib import Path
 
+from app.db import configure_engine
 from app.embedding import embed_documents_from_file, setup_database, reset_database
 from app.web import app
 import uvicorn
@@ -18,6 +19,7 @@ def cli():
 @cli.command("setup")
 def setup():
     """Set up the database for the application."""
+    configure_engine("ingest")
     setup_database()
     click.echo("Database setup complete.")
 
@@ -25,6 +27,7 @@ def setup():
 @cli.command("reset")
 def reset():
     """Reset the database."""
+    configure_engine("ingest")
     reset_database()
     click.echo("Database reset complete.")
 
@@ -33,6 +36,7 @@ def reset():
 @click.argument("file_path", type=click.Path(exists=True))
 def embed(file_path):
     """Embed documents from a JSON file."""
+    configure_engine("ingest")
     try:
         count = embed_documents_from_file(file_path)
         click.echo(f"Successfully embedded {count} documents from {file_path}")
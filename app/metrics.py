@@ -0,0 +1,56 @@
+"""In-process metrics for the embedding app."""
+import threading
+from typing import Dict, Any
+
+# Upper bounds (in seconds) of the pool wait histogram buckets
+WAIT_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, float("inf"))
+
+
+class PoolWaitMetrics:
+    """Collect how long callers wait to check a connection out of the pool."""
+
+    def __init__(self, buckets=WAIT_BUCKETS):
+        self._lock = threading.Lock()
+        self._buckets = buckets
+        self.reset()
+
+    def reset(self):
+        """Clear all recorded observations."""
+        with self._lock:
+            self.count = 0
+            self.timeouts = 0
+            self.total_seconds = 0.0
+            self.max_seconds = 0.0
+            self.bucket_counts = [0] * len(self._buckets)
+
+    def observe(self, seconds: float, timed_out: bool = False):
+        """Record a single checkout wait."""
+        with self._lock:
+            self.count += 1
+            self.total_seconds += seconds
+            self.max_seconds = max(self.max_seconds, seconds)
+            if timed_out:
+                self.timeouts += 1
+            for i, bound in enumerate(self._buckets):
+                if seconds <= bound:
+                    self.bucket_counts[i] += 1
+                    break
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Return the current metrics as a JSON-serializable dict."""
+        with self._lock:
+            return {
+                "checkouts": self.count,
+                "timeouts": self.timeouts,
+                "wait_seconds_total": self.total_seconds,
+                "wait_seconds_max": self.max_seconds,
+                "wait_seconds_avg": self.total_seconds / self.count if self.count else 0.0,
+                "wait_seconds_buckets": {
+                    ("+Inf" if bound == float("inf") else str(bound)): n
+                    for bound, n in zip(self._buckets, self.bucket_counts)
+                },
+            }
+
+
+# Shared instance used by the database pool
+pool_wait_metrics = PoolWaitMetrics()
@@ -7,7 +7,7 @@ from sqlalchemy.orm import Session
 from typing import List, Optional
 import json
 
-from app.db import get_db, get_all_documents, Document
+from app.db import get_db, get_all_documents, get_pool_status, Document
 from app.embedding import query_similar
 
 app = FastAPI(title="Embedding Test App")
@@ -223,7 +223,7 @@ async def search_get(request: Request, query: str = "", db: Session = Depends(ge
             "documents": [],
             "query": ""
         })
-    results = query_similar(query)
+    results = query_similar(db, query)
     return templates.TemplateResponse("index.html", {
         "request": request,
         "search_results": results,
@@ -239,8 +239,8 @@ def get_documents(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)
 
 
 @app.get("/api/search")
-def search_documents(query: str, limit: int = 5):
-    results = query_similar(query, limit)
+def search_documents(query: str, limit: int = 5, db: Session = Depends(get_db)):
+    results = query_similar(db, query, limit)
     return results
 
 
@@ -248,15 +248,21 @@ def search_documents(query: str, limit: int = 5):
 async def view_embeddings(request: Request, page: int = 1, db: Session = Depends(get_db)):
     per_page = 10
     # Get total count first
-    total_count = db.query(Document).count()
+    total_count = get_all_documents(db, count_only=True)
     total_pages = (total_count + per_page - 1) // per_page
     
-    # Get paginated documents directly from database
-    documents = db.query(Document).offset((page - 1) * per_page).limit(per_page).all()
+    # Get paginated documents
+    documents = get_all_documents(db, skip=(page - 1) * per_page, limit=per_page)
     
     return templates.TemplateResponse("embeddings.html", {
         "request": request,
         "documents": documents,
         "page": page,
         "total_pages": total_pages
-    })
\ No newline at end of file
+    })
+
+
+@app.get("/api/metrics")
+def get_metrics():
+    # Metrics are kept per process, so report which worker answered
+    return {"pid": os.getpid(), "db_pool": get_pool_status()}
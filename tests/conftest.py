@@ -0,0 +1,5 @@
+"""Shared pytest configuration."""
+import os
+
+# app.embedding builds its OpenAI client at import time; no request is ever sent in tests
+os.environ.setdefault("OPENAI_API_KEY", "test-key")
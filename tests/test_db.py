@@ -0,0 +1,208 @@
+"""Tests for the database utilities."""
+import sys
+import threading
+import time
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+
+from app import db
+
+
+class FakeCursor:
+    """Cursor stand-in that records execute calls."""
+
+    def __init__(self):
+        self.calls = []
+
+    def execute(self, statement, parameters, **kwargs):
+        self.calls.append((statement, parameters, kwargs))
+
+
+class ConnectAborted(Exception):
+    """Raised to stop a connection attempt once its arguments are captured."""
+
+
+def test_execute_prepared_handles_marked_statements():
+    cursor = FakeCursor()
+    context = SimpleNamespace(execution_options={"prepare": True})
+
+    handled = db._execute_prepared(cursor, "SELECT 1", {}, context)
+
+    assert handled is True
+    assert cursor.calls == [("SELECT 1", {}, {"prepare": True})]
+
+
+def test_execute_prepared_falls_through_for_unmarked_statements():
+    cursor = FakeCursor()
+
+    assert db._execute_prepared(cursor, "SELECT 1", {}, SimpleNamespace(execution_options={})) is False
+    assert db._execute_prepared(cursor, "SELECT 1", {}, None) is False
+    assert cursor.calls == []
+
+
+def test_psycopg_engine_allows_explicit_preparation():
+    pytest.importorskip("psycopg")
+    engine = db.create_db_engine("web", "psycopg")
+    captured = {}
+
+    @event.listens_for(engine, "do_connect")
+    def capture(dialect, conn_rec, cargs, cparams):
+        captured.update(cparams)
+        raise ConnectAborted()
+
+    with pytest.raises(ConnectAborted):
+        engine.connect()
+
+    # A threshold of None would make psycopg ignore prepare=True
+    assert captured["prepare_threshold"] == sys.maxsize
+    assert event.contains(engine, "do_execute", db._execute_prepared)
+    engine.dispose()
+
+
+def test_psycopg2_engine_does_not_prepare():
+    engine = db.create_db_engine("web", "psycopg2")
+
+    assert not event.contains(engine, "do_execute", db._execute_prepared)
+    engine.dispose()
+
+
+def test_create_db_engine_rejects_unknown_driver():
+    with pytest.raises(ValueError, match="Unknown database driver"):
+        db.create_db_engine("web", "mysql")
+
+
+def test_get_pool_settings_role_defaults(monkeypatch):
+    for role, defaults in db.POOL_DEFAULTS.items():
+        for key in defaults:
+            monkeypatch.delenv(f"DB_{role.upper()}_{key.upper()}", raising=False)
+
+    assert db.get_pool_settings("web") == db.POOL_DEFAULTS["web"]
+    assert db.get_pool_settings("ingest") == db.POOL_DEFAULTS["ingest"]
+
+
+def test_get_pool_settings_env_overrides(monkeypatch):
+    monkeypatch.setenv("DB_WEB_POOL_SIZE", "20")
+    monkeypatch.setenv("DB_WEB_POOL_TIMEOUT", "2.5")
+    monkeypatch.setenv("DB_WEB_POOL_PRE_PING", "false")
+    monkeypatch.setenv("DB_INGEST_POOL_PRE_PING", "yes")
+
+    web = db.get_pool_settings("web")
+    assert web["pool_size"] == 20
+    assert web["pool_timeout"] == 2.5
+    assert web["pool_pre_ping"] is False
+    assert db.get_pool_settings("ingest")["pool_pre_ping"] is True
+
+
+def test_get_pool_settings_invalid_value_names_variable(monkeypatch):
+    monkeypatch.setenv("DB_INGEST_MAX_OVERFLOW", "lots")
+
+    with pytest.raises(ValueError, match="DB_INGEST_MAX_OVERFLOW"):
+        db.get_pool_settings("ingest")
+
+
+def test_get_pool_settings_unknown_role():
+    with pytest.raises(ValueError, match="Unknown database role"):
+        db.get_pool_settings("batch")
+
+
+@pytest.fixture
+def wait_metrics():
+    db.pool_wait_metrics.reset()
+    yield db.pool_wait_metrics
+    db.pool_wait_metrics.reset()
+
+
+def test_timed_pool_excludes_connect_time(wait_metrics):
+    def slow_connect():
+        time.sleep(0.05)
+        return MagicMock()
+
+    pool = db.TimedQueuePool(slow_connect, pool_size=1, max_overflow=0)
+    pool.connect().close()
+
+    assert wait_metrics.count == 1
+    assert wait_metrics.max_seconds < 0.01
+
+
+def test_timed_pool_records_queued_wait_and_timeout(wait_metrics):
+    pool = db.TimedQueuePool(MagicMock, pool_size=1, max_overflow=0, timeout=0.05)
+    held = pool.connect()
+
+    with pytest.raises(PoolTimeoutError):
+        pool.connect()
+
+    assert wait_metrics.count == 2
+    assert wait_metrics.timeouts == 1
+    assert wait_metrics.max_seconds >= 0.05
+    held.close()
+
+
+def test_configure_engine_rebinds_session_factory(monkeypatch):
+    old_engine = db.engine
+    disposed = []
+    monkeypatch.setattr(old_engine, "dispose", lambda: disposed.append(True))
+
+    try:
+        new_engine = db.configure_engine("ingest")
+
+        assert disposed == [True]
+        assert db.engine is new_engine
+        assert new_engine is not old_engine
+        assert db.SessionLocal.kw["bind"] is new_engine
+        assert new_engine.pool.size() == db.POOL_DEFAULTS["ingest"]["pool_size"]
+    finally:
+        db.engine.dispose()
+        db.engine = old_engine
+        db.SessionLocal.configure(bind=old_engine)
+
+
+def test_timed_pool_counts_every_timeout_under_contention(wait_metrics):
+    switch_interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    pool = db.TimedQueuePool(MagicMock, pool_size=2, max_overflow=1, timeout=0.02)
+    attempts_per_thread = 50
+    raised = []
+    lock = threading.Lock()
+
+    def worker():
+        for _ in range(attempts_per_thread):
+            try:
+                conn = pool.connect()
+            except PoolTimeoutError:
+                with lock:
+                    raised.append(True)
+                continue
+            time.sleep(0.001)
+            conn.close()
+
+    try:
+        threads = [threading.Thread(target=worker) for _ in range(16)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    finally:
+        sys.setswitchinterval(switch_interval)
+
+    assert wait_metrics.count == 16 * attempts_per_thread
+    assert raised
+    assert wait_metrics.timeouts == len(raised)
+
+
+def test_get_all_documents_count_runs_single_count_query():
+    session = MagicMock()
+    session.execute.return_value.scalar_one.return_value = 42
+
+    assert db.get_all_documents(session, count_only=True) == 42
+
+    session.execute.assert_called_once()
+    stmt = session.execute.call_args.args[0]
+    sql = str(stmt.compile()).lower()
+    assert "count(*)" in sql
+    assert "embedding" not in sql
+    assert stmt.get_execution_options()["prepare"] is True
+    session.execute.return_value.scalars.assert_not_called()
@@ -0,0 +1,31 @@
+"""Tests for the embedding utilities."""
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+from app import db, embedding
+
+
+def test_query_similar_uses_injected_session(monkeypatch):
+    def no_new_sessions(*args, **kwargs):
+        raise AssertionError("query_similar must not open its own session")
+
+    monkeypatch.setattr(db, "SessionLocal", no_new_sessions)
+    monkeypatch.setattr(db, "session_scope", no_new_sessions)
+    monkeypatch.setattr(embedding, "session_scope", no_new_sessions)
+    monkeypatch.setattr(embedding, "get_embedding", lambda text: [0.1] * 1536)
+
+    doc = SimpleNamespace(id="1", title="Title", content="x" * 250, metadata={"state": "open"})
+    session = MagicMock()
+    session.execute.return_value.scalars.return_value.all.return_value = [doc]
+
+    results = embedding.query_similar(session, "query", limit=3)
+
+    session.execute.assert_called_once()
+    stmt = session.execute.call_args.args[0]
+    assert stmt.get_execution_options()["prepare"] is True
+    assert results == [{
+        "id": "1",
+        "title": "Title",
+        "content": "x" * 200 + "...",
+        "metadata": {"state": "open"},
+    }]
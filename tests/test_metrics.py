@@ -0,0 +1,34 @@
+"""Tests for the in-process metrics."""
+from app.metrics import PoolWaitMetrics
+
+
+def test_snapshot_with_no_checkouts():
+    snapshot = PoolWaitMetrics().snapshot()
+
+    assert snapshot["checkouts"] == 0
+    assert snapshot["timeouts"] == 0
+    assert snapshot["wait_seconds_avg"] == 0.0
+    assert all(n == 0 for n in snapshot["wait_seconds_buckets"].values())
+
+
+def test_observe_places_waits_in_buckets():
+    metrics = PoolWaitMetrics(buckets=(0.01, 0.1, float("inf")))
+    metrics.observe(0.0)
+    metrics.observe(0.01)
+    metrics.observe(0.05)
+    metrics.observe(2.0, timed_out=True)
+
+    snapshot = metrics.snapshot()
+    assert snapshot["wait_seconds_buckets"] == {"0.01": 2, "0.1": 1, "+Inf": 1}
+    assert snapshot["checkouts"] == 4
+    assert snapshot["timeouts"] == 1
+    assert snapshot["wait_seconds_max"] == 2.0
+    assert abs(snapshot["wait_seconds_avg"] - 2.06 / 4) < 1e-9
+
+
+def test_reset_clears_observations():
+    metrics = PoolWaitMetrics()
+    metrics.observe(0.5, timed_out=True)
+    metrics.reset()
+
+    assert metrics.snapshot() == PoolWaitMetrics().snapshot()